@@ -1,13 +1,54 @@
 #!/usr/bin/env python
 # pyright: strict
 from __future__ import annotations
+import argparse
+import array
+import hashlib
 import json
+import mmap
+import os
 import re
 import requests
 import struct
+import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, NamedTuple, BinaryIO, Any, Tuple, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Optional, NamedTuple, Any, Tuple, List, Callable, Union
+
+try:
+    import orjson
+
+    def json_dumps(value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+
+    def json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+except ImportError:
+
+    def json_dumps(value: Any) -> bytes:
+        return json.dumps(value, indent=2, ensure_ascii=False).encode()
+
+    def json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+
+TIMEOUT = 30
+# ETag/Last-Modified of downloaded files, used to issue conditional requests,
+# metadata responses are kept next to it so they can be revalidated too
+HTTP_CACHE_DIR = Path(".update-cache")
+HTTP_CACHE_PATH = HTTP_CACHE_DIR / "validators.json"
+HTTP_CACHE: Dict[str, Dict[str, str]] = {}
+SESSION = requests.Session()
+SESSION.headers["User-Agent"] = "icon-viewer-update"
+# updaters run concurrently and most of them hit the same github hosts
+SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.3)),
+)
 
 
 class Desc(NamedTuple):
@@ -18,248 +59,195 @@ class Desc(NamedTuple):
 
 def material() -> Desc:
     desc = Desc("material", "material.json", "material.ttf")
-    metadata = requests.get(
-        "https://raw.githubusercontent.com/Templarian/MaterialDesign/master/meta.json"
-    ).json()
-    font = requests.get(
-        "https://github.com/Templarian/MaterialDesign-Webfont/raw/master/fonts/materialdesignicons-webfont.ttf"
-    ).content
+    metadata = fetch(
+        "https://raw.githubusercontent.com/Templarian/MaterialDesign/master/meta.json",
+        "https://github.com/Templarian/MaterialDesign-Webfont/raw/master/fonts/materialdesignicons-webfont.ttf",
+        desc.font,
+    )
 
-    names: Dict[str, int] = {}
-    for meta in metadata:
-        name = meta["name"]
-        codepoint = int(meta["codepoint"], 16)
-        names[name] = codepoint
-    with open(desc.metadata, "w") as meta_file:
-        json.dump(
-            {
-                "family": "Material Design Icons",
-                "names": names,
-            },
-            meta_file,
-            indent=2,
-        )
-
-    with open(desc.font, "wb") as font_file:
-        font_file.write(font)
+    names = {meta["name"]: int(meta["codepoint"], 16) for meta in json_loads(metadata)}
+    write_json(
+        desc.metadata,
+        {
+            "family": "Material Design Icons",
+            "names": names,
+        },
+    )
 
     return desc
 
 
+RE_FLUENT = re.compile("ic_fluent_(.+)_20_(filled|regular)", re.ASCII)
+FLUENT_NAME_TRANS = str.maketrans("_", "-")
+
+
 def fluent() -> Desc:
     desc = Desc("fluent", "fluent.json", "fluent.ttf")
-    metadata = requests.get(
-        "https://github.com/microsoft/fluentui-system-icons/raw/main/fonts/FluentSystemIcons-Resizable.json"
-    ).json()
-    font = requests.get(
-        "https://github.com/microsoft/fluentui-system-icons/raw/main/fonts/FluentSystemIcons-Resizable.ttf"
-    ).content
+    metadata = fetch(
+        "https://github.com/microsoft/fluentui-system-icons/raw/main/fonts/FluentSystemIcons-Resizable.json",
+        "https://github.com/microsoft/fluentui-system-icons/raw/main/fonts/FluentSystemIcons-Resizable.ttf",
+        desc.font,
+    )
 
     names: Dict[str, int] = {}
-    re_name = re.compile("ic_fluent_(.+)_20_(filled|regular)")
-    for name, codepoint in metadata.items():
-        match_name = re_name.match(name)
+    for name, codepoint in json_loads(metadata).items():
+        match_name = RE_FLUENT.match(name)
         if match_name is None:
             print(f"[fluent] unmatched: {name}")
             continue
-        name = match_name.group(1).replace("_", "-")
+        name = match_name.group(1).translate(FLUENT_NAME_TRANS)
         suffix = match_name.group(2)
         if suffix != "regular":
             name = f"{name}-{suffix}"
         names[name] = codepoint
-    with open(desc.metadata, "w") as meta_file:
-        json.dump(
-            {
-                "family": "FluentSystemIcons-Resizable",
-                "names": names,
-            },
-            meta_file,
-            indent=2,
-        )
-
-    with open(desc.font, "wb") as font_file:
-        font_file.write(font)
+    write_json(
+        desc.metadata,
+        {
+            "family": "FluentSystemIcons-Resizable",
+            "names": names,
+        },
+    )
 
     return desc
 
 
-def phosphor() -> Desc:
-    desc = Desc("phosphor", "phosphor.json", "phosphor.ttf")
-    metadata = requests.get(
-        "https://github.com/phosphor-icons/web/raw/master/src/regular/style.css"
-    ).text
-    font = requests.get(
-        "https://github.com/phosphor-icons/web/raw/master/src/regular/Phosphor.ttf"
-    ).content
+def css_icon(match: re.Match[str]) -> Tuple[str, int]:
+    return match[1], int(match[2], 16)
 
-    names: Dict[str, int] = {}
-    for match in re.finditer(
-        '^\\.ph\\.ph-([^:]*):.*\n\\s+content:\\s+"\\\\(.*)"',
-        metadata,
-        re.MULTILINE,
-    ):
-        names[match.group(1)] = int(match.group(2), 16)
-    with open(desc.metadata, "w") as meta_file:
-        json.dump(
-            {"family": "Phosphor", "names": names},
-            meta_file,
-            indent=2,
-        )
-
-    with open(desc.font, "wb") as font_file:
-        font_file.write(font)
+
+def css_updater(
+    name: str,
+    family: str,
+    metadata_url: str,
+    font_url: str,
+    regex: re.Pattern[str],
+    icon: Callable[[re.Match[str]], Tuple[str, int]] = css_icon,
+) -> Desc:
+    """Updater for fonts whose icon names are only published in a CSS stylesheet"""
+    desc = Desc(name, f"{name}.json", f"{name}.ttf")
+    metadata = fetch(metadata_url, font_url, desc.font).decode()
+
+    names = dict(map(icon, regex.finditer(metadata)))
+    write_json(desc.metadata, {"family": family, "names": names})
 
     return desc
 
 
-def remix() -> Desc:
-    desc = Desc("remix", "remix.json", "remix.ttf")
-    metadata = requests.get(
-        "https://github.com/Remix-Design/RemixIcon/raw/master/fonts/remixicon.css"
-    ).text
-    font = requests.get(
-        "https://github.com/Remix-Design/RemixIcon/raw/master/fonts/remixicon.ttf"
-    ).content
-
-    # .ri-arrow-left-right-fill:before { content: "\ea61"; }
-    names: Dict[str, int] = {}
-    for match in re.finditer(
-        '^\\.ri-([^:]+)-(fill|line):.*{\\s+content:\\s+"\\\\(.*)"',
-        metadata,
-        re.MULTILINE,
-    ):
-        name = match.group(1)
-        suffix = match.group(2)
-        if suffix != "line":
-            name = f"{name}-{suffix}"
-        names[name] = int(match.group(3), 16)
-    with open(desc.metadata, "w") as meta_file:
-        json.dump(
-            {"family": "remixicon", "names": names},
-            meta_file,
-            indent=2,
-        )
+RE_PHOSPHOR = re.compile(
+    '^\\.ph\\.ph-([^:]*+):.*+\n\\s++content:\\s++"\\\\([0-9A-Fa-f]++)"',
+    re.MULTILINE | re.ASCII,
+)
 
-    with open(desc.font, "wb") as font_file:
-        font_file.write(font)
 
-    return desc
+def phosphor() -> Desc:
+    return css_updater(
+        "phosphor",
+        "Phosphor",
+        "https://github.com/phosphor-icons/web/raw/master/src/regular/style.css",
+        "https://github.com/phosphor-icons/web/raw/master/src/regular/Phosphor.ttf",
+        RE_PHOSPHOR,
+    )
+
+
+# .ri-arrow-left-right-fill:before { content: "\ea61"; }
+RE_REMIX = re.compile(
+    '^\\.ri-([^:]+)-(fill|line):.*{\\s++content:\\s++"\\\\([0-9A-Fa-f]++)"',
+    re.MULTILINE | re.ASCII,
+)
+
+
+def remix_icon(match: re.Match[str]) -> Tuple[str, int]:
+    name, suffix, codepoint = match.groups()
+    if suffix != "line":
+        name = f"{name}-{suffix}"
+    return name, int(codepoint, 16)
+
+
+def remix() -> Desc:
+    return css_updater(
+        "remix",
+        "remixicon",
+        "https://github.com/Remix-Design/RemixIcon/raw/master/fonts/remixicon.css",
+        "https://github.com/Remix-Design/RemixIcon/raw/master/fonts/remixicon.ttf",
+        RE_REMIX,
+        remix_icon,
+    )
 
 
 def typicons() -> Desc:
     desc = Desc("typicons", "typicons.json", "typicons.ttf")
-    metadata = requests.get(
-        "https://raw.githubusercontent.com/stephenhutchings/typicons.font/master/src/font/typicons.json"
-    ).json()
-    font = requests.get(
-        "https://github.com/stephenhutchings/typicons.font/raw/master/src/font/typicons.ttf"
-    ).content
-
-    with open(desc.metadata, "w") as meta_file:
-        json.dump(
-            {
-                "family": "typicons",
-                "names": metadata,
-            },
-            meta_file,
-            indent=2,
-        )
-
-    with open(desc.font, "wb") as font_file:
-        font_file.write(font)
+    metadata = fetch(
+        "https://raw.githubusercontent.com/stephenhutchings/typicons.font/master/src/font/typicons.json",
+        "https://github.com/stephenhutchings/typicons.font/raw/master/src/font/typicons.ttf",
+        desc.font,
+    )
+
+    write_json(
+        desc.metadata,
+        {
+            "family": "typicons",
+            "names": json_loads(metadata),
+        },
+    )
 
     return desc
 
 
+# .codicon-gist-new:before { content: "\ea60" }
+RE_CODICON = re.compile(
+    '^\\.codicon-([^:]++):.*{\\s++content:\\s++"\\\\([0-9A-Fa-f]++)"',
+    re.MULTILINE | re.ASCII,
+)
+
+
 def codicon() -> Desc:
-    desc = Desc("codicon", "codicon.json", "codicon.ttf")
-    metadata = requests.get(
-        "https://github.com/microsoft/vscode-codicons/raw/main/dist/codicon.css"
-    ).text
-    font = requests.get(
-        "https://github.com/microsoft/vscode-codicons/raw/main/dist/codicon.ttf"
-    ).content
-
-    # .codicon-gist-new:before { content: "\ea60" }
-    names: Dict[str, int] = {}
-    for match in re.finditer(
-        '^\\.codicon-([^:]+):.*{\\s+content:\\s+"\\\\(.*)"',
-        metadata,
-        re.MULTILINE,
-    ):
-        names[match.group(1)] = int(match.group(2), 16)
-    with open(desc.metadata, "w") as meta_file:
-        json.dump(
-            {"family": "codicon", "names": names},
-            meta_file,
-            indent=2,
-        )
-
-    with open(desc.font, "wb") as font_file:
-        font_file.write(font)
+    return css_updater(
+        "codicon",
+        "codicon",
+        "https://github.com/microsoft/vscode-codicons/raw/main/dist/codicon.css",
+        "https://github.com/microsoft/vscode-codicons/raw/main/dist/codicon.ttf",
+        RE_CODICON,
+    )
 
-    return desc
+
+# single line like .fa-fill-drip:before{content:"\f576"}
+RE_AWESOME = re.compile(
+    '\\.fa-([^:{}\\.]++):before{\\s*+content:\\s*+"\\\\([^"]++)"[^}]*+}',
+    re.ASCII,
+)
 
 
 def awesome() -> Desc:
-    desc = Desc("awesome", "awesome.json", "awesome.ttf")
     # inspect https://fontawesome.com to get this URLs
     version = "6.4.0"
-    font = requests.get(
-        f"https://site-assets.fontawesome.com/releases/v{version}/webfonts/fa-regular-400.ttf"
-    ).content
-    metadata = requests.get(
-        f"https://site-assets.fontawesome.com/releases/v{version}/css/all.css"
-    ).text
-
-    # single line like .fa-fill-drip:before{content:"\f576"}
-    names: Dict[str, int] = {}
-    for match in re.finditer(
-        '\\.fa-([^:{}\\.]+):before{\\s*content:\\s*"\\\\([^"]+)"[^}]*}',
-        metadata,
-        re.MULTILINE,
-    ):
-        names[match.group(1)] = int(match.group(2), 16)
-    with open(desc.metadata, "w") as meta_file:
-        json.dump(
-            {"family": "Font Awesome 6 Pro", "names": names},
-            meta_file,
-            indent=2,
-        )
-
-    with open(desc.font, "wb") as font_file:
-        font_file.write(font)
+    return css_updater(
+        "awesome",
+        "Font Awesome 6 Pro",
+        f"https://site-assets.fontawesome.com/releases/v{version}/css/all.css",
+        f"https://site-assets.fontawesome.com/releases/v{version}/webfonts/fa-regular-400.ttf",
+        RE_AWESOME,
+    )
 
-    return desc
+
+RE_WEATHER = re.compile(
+    '^\\.wi-([^:]*+):.*+\n\\s++content:\\s++"\\\\([0-9A-Fa-f]++)"',
+    re.MULTILINE | re.ASCII,
+)
 
 
 def weather() -> Desc:
-    desc = Desc("weather", "weather.json", "weather.ttf")
-    font = requests.get(
-        "https://github.com/erikflowers/weather-icons/raw/master/font/weathericons-regular-webfont.ttf"
-    ).content
-    metadata = requests.get(
-        "https://github.com/erikflowers/weather-icons/raw/master/css/weather-icons.css"
-    ).text
+    return css_updater(
+        "weather",
+        "Weather Icons",
+        "https://github.com/erikflowers/weather-icons/raw/master/css/weather-icons.css",
+        "https://github.com/erikflowers/weather-icons/raw/master/font/weathericons-regular-webfont.ttf",
+        RE_WEATHER,
+    )
 
-    names: Dict[str, int] = {}
-    for match in re.finditer(
-        '^\\.wi-([^:]*):.*\n\\s+content:\\s+"\\\\(.*)"',
-        metadata,
-        re.MULTILINE,
-    ):
-        names[match.group(1)] = int(match.group(2), 16)
-    with open(desc.metadata, "w") as meta_file:
-        json.dump(
-            {"family": "Weather Icons", "names": names},
-            meta_file,
-            indent=2,
-        )
-
-    with open(desc.font, "wb") as font_file:
-        font_file.write(font)
 
-    return desc
+# glyphs named after their codepoint, like uni2615 or u1F600
+RE_CODEPOINT_NAME = re.compile("^u(ni)?([0-9A-Fa-f]+)$")
+UNICODE_NAME_TRANS = str.maketrans(" ", "-")
 
 
 def notoemoji() -> Desc:
@@ -273,81 +261,180 @@ def notoemoji() -> Desc:
         "variation-selector-15",
         "variation-selector-16",
     }
-    bad_name_regex = re.compile("^u(ni)?([0-9A-Fa-f]+)$")
     for name, codepoint in font.name_to_codepoint.items():
-        bad_match = bad_name_regex.match(name)
+        # renaming preserves a ".tag" suffix, so drop those before any lookups
+        if name.endswith(".tag"):
+            continue
+        bad_match = RE_CODEPOINT_NAME.match(name)
         if bad_match:
             char = chr(int(bad_match.group(2), 16))
-            name = unicodedata.name(char, name).lower().replace(" ", "-")
+            name = unicodedata.name(char, name).lower().translate(UNICODE_NAME_TRANS)
         else:
             name = camel_to_dash(name)
-        if name.endswith(".tag") or name in skip:
+        if name in skip:
             continue
         names[name] = codepoint
 
-    with open(desc.metadata, "w") as meta_file:
-        json.dump(
-            {"family": font.name["family"], "names": names},
-            meta_file,
-            indent=2,
-        )
+    write_json(desc.metadata, {"family": font.name["family"], "names": names})
 
     return desc
 
 
+def file_sha256(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as file:
+            return hashlib.file_digest(file, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def download(url: str, path: str) -> None:
+    """Download `url` to `path` unless the server reports it is not modified"""
+    headers: Dict[str, str] = {}
+    validators = HTTP_CACHE.get(url, {})
+    # only trust validators if the file on disk is the one they were issued for
+    if (sha256 := validators.get("sha256")) and sha256 == file_sha256(path):
+        if etag := validators.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := validators.get("last_modified"):
+            headers["If-Modified-Since"] = last_modified
+    with SESSION.get(url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+        response.raise_for_status()
+        if response.status_code == 304:
+            return
+        # write to a temporary file so an interrupted download never replaces a font
+        path_tmp = f"{path}.tmp"
+        digest = hashlib.sha256()
+        size = 0
+        with open(path_tmp, "wb") as file:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                digest.update(chunk)
+                size += file.write(chunk)
+        # Content-Length counts encoded bytes, so only compare unencoded bodies
+        length = response.headers.get("Content-Length")
+        encoded = "Content-Encoding" in response.headers
+        if length and not encoded and int(length) != size:
+            os.remove(path_tmp)
+            raise ValueError(f"Truncated download {url}: {size} of {length} bytes")
+        HTTP_CACHE[url] = {
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "sha256": digest.hexdigest(),
+        }
+        os.replace(path_tmp, path)
+
+
+def fetch(metadata_url: str, font_url: str, font_path: str) -> bytes:
+    """Fetch metadata while the font is downloaded to `font_path` concurrently"""
+    metadata_path = HTTP_CACHE_DIR / hashlib.sha256(metadata_url.encode()).hexdigest()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        font = executor.submit(download, font_url, font_path)
+        download(metadata_url, str(metadata_path))
+        font.result()
+    return metadata_path.read_bytes()
+
+
+def write_json(path: str, value: Any) -> None:
+    """Write `value` to `path` unless the file already has the same content"""
+    data = json_dumps(value)
+    try:
+        with open(path, "rb") as file:
+            if file.read() == data:
+                return
+    except FileNotFoundError:
+        pass
+    path_tmp = f"{path}.tmp"
+    with open(path_tmp, "wb") as file:
+        file.write(data)
+    os.replace(path_tmp, path)
+
+
+RE_CAMEL = re.compile("(?<!^)(?=[A-Z])")
+
+
 def camel_to_dash(value: str) -> str:
-    split = list(i for i, (a, b) in enumerate(zip(value, value.lower())) if a != b)
-    split = [0, *split, len(value)]
-    value = value.lower()
-    return "-".join(
-        filter(None, (value[start:end] for start, end in zip(split, split[1:])))
-    )
+    return RE_CAMEL.sub("-", value).lower()
+
+
+STRUCT_I8 = struct.Struct(">b")
+STRUCT_U16 = struct.Struct(">H")
+STRUCT_I16 = struct.Struct(">h")
+STRUCT_U32 = struct.Struct(">I")
+STRUCT_I32 = struct.Struct(">i")
+STRUCT_U64 = struct.Struct(">Q")
 
 
 class Reader:
-    def __init__(self, file: BinaryIO):
-        self.file = file
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: Union[bytes, mmap.mmap]):
+        self.data = data
+        self.pos = 0
 
     def read(self, size: int, at: Optional[int] = None) -> bytes:
         if at is not None:
-            self.file.seek(at)
-        return self.file.read(size)
+            self.pos = at
+        start = self.pos
+        self.pos += size
+        return self.data[start : self.pos]
 
     def read_string(self, size: int, at: Optional[int] = None) -> str:
         return self.read(size, at).decode()
 
     def seek(self, target: int, whence: int = 0) -> None:
-        self.file.seek(target, whence)
+        if whence == 1:
+            target += self.pos
+        elif whence == 2:
+            target += len(self.data)
+        self.pos = target
 
-    def read_struct(self, format: str, at: Optional[int] = None) -> Tuple[Any]:
+    def read_struct(self, format: str, at: Optional[int] = None) -> Tuple[Any, ...]:
         if at is not None:
-            self.file.seek(at)
+            self.pos = at
         st = struct.Struct(format)
-        return st.unpack(self.file.read(st.size))
+        value = st.unpack_from(self.data, self.pos)
+        self.pos += st.size
+        return value
 
     def read_u8(self) -> int:
-        return self.file.read(1)[0]
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
 
     def read_i8(self) -> int:
-        return self.read_struct(">b")[0]
+        value = STRUCT_I8.unpack_from(self.data, self.pos)[0]
+        self.pos += 1
+        return value
 
     def read_u16(self) -> int:
-        return self.read_struct(">H")[0]
+        value = STRUCT_U16.unpack_from(self.data, self.pos)[0]
+        self.pos += 2
+        return value
 
     def read_i16(self) -> int:
-        return self.read_struct(">h")[0]
+        value = STRUCT_I16.unpack_from(self.data, self.pos)[0]
+        self.pos += 2
+        return value
 
     def read_u32(self) -> int:
-        return self.read_struct(">I")[0]
+        value = STRUCT_U32.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return value
 
     def read_i32(self) -> int:
-        return self.read_struct(">i")[0]
+        value = STRUCT_I32.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return value
 
     def read_u64(self) -> int:
-        return self.read_struct(">Q")[0]
+        value = STRUCT_U64.unpack_from(self.data, self.pos)[0]
+        self.pos += 8
+        return value
 
     def read_fixed(self) -> float:
-        return self.read_i32() / 65536
+        value = STRUCT_I32.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return value / 65536
 
 
 class FontTable(NamedTuple):
@@ -356,6 +443,18 @@ class FontTable(NamedTuple):
     length: int
 
 
+class NameRecord(NamedTuple):
+    platfrom_id: int
+    encoding_id: int
+    langauge_id: int
+    name_id: int
+    lenght: int
+    offset: int
+
+
+STRUCT_NAME_RECORD = struct.Struct(">6H")
+
+
 class FontHead(NamedTuple):
     versoin: Tuple[int, int]
     font_revision: int
@@ -369,8 +468,19 @@ class Font:
         - https://learn.microsoft.com/en-us/typography/opentype/spec/otff#organization-of-an-opentype-font
     """
 
+    __slots__ = (
+        "reader",
+        "tables",
+        "glyph_count",
+        "index_to_codepoint",
+        "index_to_name",
+        "name_to_codepoint",
+        "name",
+    )
+
     def __init__(self, path: str):
-        reader = Reader(Path(path).expanduser().open("rb"))
+        with Path(path).expanduser().open("rb") as file:
+            reader = Reader(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
         self.reader = reader
 
         reader.read_u32()  # sfntVersion
@@ -379,14 +489,12 @@ class Font:
         reader.read_u16()  # entrySelector
         reader.read_u16()  # rangeShift
         # at table records
-        self.tables: Dict[str, FontTable] = {}
-        for _ in range(num_tables):
-            tag = reader.read_string(4)
-            self.tables[tag] = FontTable(
-                reader.read_u32(),
-                reader.read_u32(),
-                reader.read_u32(),
+        self.tables: Dict[str, FontTable] = {
+            tag.decode(): FontTable(checksum, offset, length)
+            for tag, checksum, offset, length in struct.iter_unpack(
+                ">4sIII", reader.read(16 * num_tables)
             )
+        }
 
         # Maximum Profile
         maxp = self.tables["maxp"]
@@ -396,17 +504,17 @@ class Font:
         self.index_to_codepoint = self.parse_cmap()
         self.index_to_name = self.parse_post()
 
-        self.name_to_codepoint: Dict[str, int] = {}
-        for index in range(self.glyph_count):
-            codepoint = self.index_to_codepoint.get(index)
-            name = self.index_to_name.get(index)
-            if name is None or codepoint is None or codepoint == 0:
-                continue
-            self.name_to_codepoint[name] = codepoint
+        # post table is sparse, so iterate named glyphs only
+        self.name_to_codepoint: Dict[str, int] = {
+            name: codepoint
+            for index, name in self.index_to_name.items()
+            if index < self.glyph_count
+            and (codepoint := self.index_to_codepoint[index])
+        }
 
         self.name = self.parse_name()
 
-    def parse_cmap(self) -> Dict[int, int]:
+    def parse_cmap(self) -> array.array[int]:
         """Character Map
 
         Reference: https://learn.microsoft.com/en-us/typography/opentype/spec/cmap
@@ -445,14 +553,19 @@ class Font:
 
         # groups
         num_groups = self.reader.read_u32()
-        glyph_to_codepoint: Dict[int, int] = {}
-        for _ in range(num_groups):
-            codepoint_start = self.reader.read_u32()
-            codepoint_end = self.reader.read_u32()
-            glyph_index = self.reader.read_u32()
-            for codepoint in range(codepoint_start, codepoint_end + 1):
-                glyph_to_codepoint[glyph_index] = codepoint
-                glyph_index += 1
+        # glyph indices are dense, 0 marks glyphs without a codepoint
+        glyph_to_codepoint = array.array("I", [0]) * self.glyph_count
+        for codepoint_start, codepoint_end, glyph_index in struct.iter_unpack(
+            ">III", self.reader.read(12 * num_groups)
+        ):
+            # clamp so slice assignment never resizes the array
+            count = min(
+                codepoint_end - codepoint_start + 1, self.glyph_count - glyph_index
+            )
+            if count > 0:
+                glyph_to_codepoint[glyph_index : glyph_index + count] = array.array(
+                    "I", range(codepoint_start, codepoint_start + count)
+                )
 
         return glyph_to_codepoint
 
@@ -467,16 +580,23 @@ class Font:
 
         # https://learn.microsoft.com/en-us/typography/opentype/spec/post#version-20
         glyph_count = self.reader.read_u16()
-        glyph_to_index: Dict[int, int] = {}
-        for glyph_index in range(glyph_count):
-            name_index = self.reader.read_u16()
-            if name_index >= 258:
-                glyph_to_index[glyph_index] = name_index - 258
+        glyph_to_index: Dict[int, int] = {
+            glyph_index: name_index - 258
+            for glyph_index, name_index in enumerate(
+                self.reader.read_struct(f">{glyph_count}H")
+            )
+            if name_index >= 258
+        }
 
+        # pascal strings, walked directly to avoid two reader calls per name,
+        # glyph names are restricted to printable ASCII so latin-1 decoding is exact
+        data, pos = self.reader.data, self.reader.pos
         names: List[str] = []
         for _ in range(max(glyph_to_index.values()) + 1):
-            length = self.reader.read_u8()
-            names.append(self.reader.read_string(length))
+            end = pos + 1 + data[pos]
+            names.append(data[pos + 1 : end].decode("latin-1"))
+            pos = end
+        self.reader.pos = pos
 
         return {glyph: names[index] for glyph, index in glyph_to_index.items()}
 
@@ -488,24 +608,11 @@ class Font:
         record_count = self.reader.read_u16()
         storage_offset = self.reader.read_u16()
 
-        class NameRecord(NamedTuple):
-            platfrom_id: int
-            encoding_id: int
-            langauge_id: int
-            name_id: int
-            lenght: int
-            offset: int
-
         records: List[NameRecord] = []
-        for _ in range(record_count):
-            record = NameRecord(
-                self.reader.read_u16(),
-                self.reader.read_u16(),
-                self.reader.read_u16(),
-                self.reader.read_u16(),
-                self.reader.read_u16(),
-                self.reader.read_u16(),
-            )
+        for fields in STRUCT_NAME_RECORD.iter_unpack(
+            self.reader.read(STRUCT_NAME_RECORD.size * record_count)
+        ):
+            record = NameRecord._make(fields)
             id = (record.platfrom_id, record.langauge_id, record.encoding_id)
             if id not in {(3, 1033, 1), (3, 1033, 10)}:
                 continue
@@ -531,9 +638,26 @@ class Font:
         return names
 
 
+def run_updater(updater: Callable[[], Desc]) -> Desc:
+    start = time.monotonic()
+    desc = updater()
+    print(f"{updater.__name__} {time.monotonic() - start:.2f}s")
+    return desc
+
+
 def main() -> None:
-    descriptions: List[Any] = []
-    for updater in [
+    parser = argparse.ArgumentParser(description="update icon fonts and metadata")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="download all fonts even if they have not changed upstream",
+    )
+    opts = parser.parse_args()
+    HTTP_CACHE_DIR.mkdir(exist_ok=True)
+    if not opts.force and HTTP_CACHE_PATH.exists():
+        HTTP_CACHE.update(json.loads(HTTP_CACHE_PATH.read_bytes()))
+
+    updaters = [
         material,
         fluent,
         phosphor,
@@ -543,13 +667,12 @@ def main() -> None:
         weather,
         typicons,
         notoemoji,
-    ]:
-        print(updater.__name__)
-        desc = updater()
-        descriptions.append(desc._asdict())
+    ]
+    with SESSION, ThreadPoolExecutor(max_workers=len(updaters)) as executor:
+        descs = list(executor.map(run_updater, updaters))
 
-    with open("descriptions.json", "w") as all_file:
-        json.dump(descriptions, all_file, indent=2)
+    write_json("descriptions.json", [desc._asdict() for desc in descs])
+    write_json(str(HTTP_CACHE_PATH), HTTP_CACHE)
 
 
 if __name__ == "__main__":